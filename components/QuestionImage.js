@@ -0,0 +1,74 @@
+import Image from 'next/image';
+
+function imageTokenToSrc(token, basePathPrefix) {
+  const stripped = token.startsWith('image/') ? token.slice('image/'.length) : token;
+  const relativePath = stripped.replace(/^\/+/, '');
+  return `${basePathPrefix}${relativePath}`;
+}
+
+/**
+ * Renders an `images/...` token from question content.
+ *
+ * `asset` comes from the build-time image manifest (see lib/imageAssets.js):
+ * - inline: the image is embedded as a data URI, no request is made
+ * - sprite: the image is cropped out of a shared sprite sheet, which still
+ *   loads lazily like any other next/image
+ * Without an asset the image file is requested directly.
+ *
+ * Pass `maxWidth`/`maxHeight` (px) to bound the rendered size, as option
+ * images do; otherwise the image scales down to fit its container.
+ */
+export default function QuestionImage({ token, asset, basePathPrefix, alt, maxWidth, maxHeight }) {
+  const bounded = maxWidth !== undefined || maxHeight !== undefined;
+  const imageStyle = bounded
+    ? { maxWidth, maxHeight, height: 'auto', width: 'auto' }
+    : { maxWidth: '100%', height: 'auto' };
+
+  if (asset?.type === 'sprite') {
+    const { x, y, width, height, sheetWidth, sheetHeight } = asset;
+    const scale = Math.min(1, (maxWidth ?? width) / width, (maxHeight ?? height) / height);
+    // The frame clips a lazily loaded full sheet, positioned in percentages of
+    // the frame so the crop survives any responsive down-scaling.
+    return (
+      <span
+        style={{
+          display: 'block',
+          position: 'relative',
+          overflow: 'hidden',
+          width: Math.round(width * scale),
+          maxWidth: '100%',
+          aspectRatio: `${width} / ${height}`,
+        }}
+      >
+        <Image
+          src={`${basePathPrefix}${asset.src}`}
+          alt={alt}
+          width={sheetWidth}
+          height={sheetHeight}
+          style={{
+            position: 'absolute',
+            left: `${(-x / width) * 100}%`,
+            top: `${(-y / height) * 100}%`,
+            width: `${(sheetWidth / width) * 100}%`,
+            height: `${(sheetHeight / height) * 100}%`,
+            maxWidth: 'none',
+          }}
+        />
+      </span>
+    );
+  }
+
+  if (asset?.type === 'inline') {
+    return <Image src={asset.src} alt={alt} width={asset.width} height={asset.height} style={imageStyle} />;
+  }
+
+  return (
+    <Image
+      src={imageTokenToSrc(token, basePathPrefix)}
+      alt={alt}
+      width={1200}
+      height={800}
+      style={imageStyle}
+    />
+  );
+}
@@ -0,0 +1,42 @@
+// Server-side helper for getStaticProps: looks up the inline/sprite entries
+// produced by scripts/build_image_assets.mjs for the images a page references.
+// When the manifest has not been built (e.g. `next dev`), pages fall back to
+// plain per-file images.
+
+const CONTENT_FIELDS = ['question', 'choices', 'explanation'];
+
+function collectImageTokens(questions) {
+  const tokens = new Set();
+  questions.forEach((q) => {
+    CONTENT_FIELDS.forEach((field) => {
+      const value = Array.isArray(q?.[field]) ? q[field] : [];
+      const parts = field === 'choices' ? value.flatMap((c) => (Array.isArray(c) ? c : [])) : value;
+      parts.forEach((part) => {
+        if (typeof part === 'string' && (part.startsWith('images/') || part.startsWith('image/'))) {
+          tokens.add(part);
+        }
+      });
+    });
+  });
+  return tokens;
+}
+
+export async function loadImageAssets(questions) {
+  const fs = await import('fs/promises');
+  const path = await import('path');
+
+  let manifest;
+  try {
+    const raw = await fs.readFile(path.join(process.cwd(), 'data', '_image_assets.json'), 'utf-8');
+    manifest = JSON.parse(raw);
+  } catch (error) {
+    return {};
+  }
+
+  const assets = manifest?.assets || {};
+  const imageAssets = {};
+  collectImageTokens(questions).forEach((token) => {
+    if (assets[token]) imageAssets[token] = assets[token];
+  });
+  return imageAssets;
+}
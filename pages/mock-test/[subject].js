@@ -1,8 +1,9 @@
 import { useEffect, useMemo, useRef, useState } from 'react';
-import Image from 'next/image';
 import { useRouter } from 'next/router';
 import RenderContent from '../../components/RenderContent';
+import QuestionImage from '../../components/QuestionImage';
 import { analytics } from '../../lib/analytics';
+import { loadImageAssets } from '../../lib/imageAssets';
 
 // 80-minute mock test timer (in seconds)
 const TEST_DURATION_SECONDS = 80 * 60;
@@ -26,12 +27,6 @@ function isImageToken(token) {
   return typeof token === 'string' && (token.startsWith('images/') || token.startsWith('image/'));
 }
 
-function imageTokenToSrc(token, basePathPrefix) {
-  const stripped = token.startsWith('image/') ? token.slice('image/'.length) : token;
-  const relativePath = stripped.replace(/^\/+/, '');
-  return `${basePathPrefix}${relativePath}`;
-}
-
 function TimerContent({ remaining, running, finished }) {
   return (
     <>
@@ -137,7 +132,7 @@ export async function getStaticProps({ params }) {
     allIds = QUESTION_IDS;
   } catch (error) {
     console.error(`Failed to load questions for subject: ${subject}`, error);
-    return { props: { subject, allIds: [], questions: [], yearIdsMap: {}, availableYears: [] } };
+    return { props: { subject, allIds: [], questions: [], yearIdsMap: {}, availableYears: [], imageAssets: {} } };
   }
 
   const questionsDir = path.join(process.cwd(), 'data', subject);
@@ -166,16 +161,20 @@ export async function getStaticProps({ params }) {
 
   const availableYears = Object.keys(yearIdsMap).map(y => parseInt(y)).sort((a, b) => b - a);
 
-  return { props: { subject, allIds, questions, yearIdsMap, availableYears } };
+  // Inline/sprite entries for referenced images (see scripts/build_image_assets.mjs)
+  const imageAssets = await loadImageAssets(questions);
+
+  return { props: { subject, allIds, questions, yearIdsMap, availableYears, imageAssets } };
 }
 
-export default function MockTestSubjectPage({ subject, allIds, questions, yearIdsMap, availableYears }) {
+export default function MockTestSubjectPage({ subject, allIds, questions, yearIdsMap, availableYears, imageAssets }) {
   const router = useRouter();
   const { year, session_id } = router.query;
   
   const ALL_IDS = Array.isArray(allIds) ? allIds : [];
   const ALL_QUESTIONS = Array.isArray(questions) ? questions : [];
   const YEAR_IDS_MAP = yearIdsMap || {};
+  const IMAGE_ASSETS = imageAssets || {};
 
   const questionsById = useMemo(() => {
     const map = new Map();
@@ -393,15 +392,13 @@ export default function MockTestSubjectPage({ subject, allIds, questions, yearId
 
                     {questionParts.map((part, partIndex) => {
                       if (isImageToken(part)) {
-                        const src = imageTokenToSrc(part, basePathPrefix);
                         return (
                           <div key={`q-${partIndex}`} className="question-image">
-                            <Image
-                              src={src}
+                            <QuestionImage
+                              token={part}
+                              asset={IMAGE_ASSETS[part]}
+                              basePathPrefix={basePathPrefix}
                               alt={`Question ${questionNumber}`}
-                              width={1200}
-                              height={800}
-                              style={{ maxWidth: '100%', height: 'auto' }}
                             />
                           </div>
                         );
@@ -428,15 +425,15 @@ export default function MockTestSubjectPage({ subject, allIds, questions, yearId
                             <span className={`option-circle${isSelected ? ' option-circle--selected' : ''}`} />
                             {parts.map((part, partIndex) => {
                               if (isImageToken(part)) {
-                                const src = imageTokenToSrc(part, basePathPrefix);
                                 return (
                                   <div key={`o-${partIndex}`} className="option-image">
-                                    <Image
-                                      src={src}
+                                    <QuestionImage
+                                      token={part}
+                                      asset={IMAGE_ASSETS[part]}
+                                      basePathPrefix={basePathPrefix}
                                       alt={`Question ${questionNumber} option ${optionIndex + 1}`}
-                                      width={1200}
-                                      height={800}
-                                      style={{ maxWidth: 150, maxHeight: 150, height: 'auto', width: 'auto' }}
+                                      maxWidth={150}
+                                      maxHeight={150}
                                     />
                                   </div>
                                 );
@@ -1,9 +1,10 @@
 import { useEffect, useMemo, useState } from 'react';
 import Link from 'next/link';
-import Image from 'next/image';
 import { useRouter } from 'next/router';
 import RenderContent from '../../components/RenderContent';
+import QuestionImage from '../../components/QuestionImage';
 import { analytics } from '../../lib/analytics';
+import { loadImageAssets } from '../../lib/imageAssets';
 
 const SUBJECTS = [
   { value: 'bio', label: 'Biology' },
@@ -16,12 +17,6 @@ function isImageToken(token) {
   return typeof token === 'string' && (token.startsWith('images/') || token.startsWith('image/'));
 }
 
-function imageTokenToSrc(token, basePathPrefix) {
-  const stripped = token.startsWith('image/') ? token.slice('image/'.length) : token;
-  const relativePath = stripped.replace(/^\/+/, '');
-  return `${basePathPrefix}${relativePath}`;
-}
-
 function formatTime(totalSeconds) {
   const minutes = Math.floor(totalSeconds / 60);
   const seconds = totalSeconds % 60;
@@ -61,14 +56,18 @@ export async function getStaticProps({ params }) {
     })
   );
 
-  return { props: { subject, questions } };
+  // Inline/sprite entries for referenced images (see scripts/build_image_assets.mjs)
+  const imageAssets = await loadImageAssets(questions);
+
+  return { props: { subject, questions, imageAssets } };
 }
 
-export default function ResultsSubjectPage({ subject, questions }) {
+export default function ResultsSubjectPage({ subject, questions, imageAssets }) {
   const router = useRouter();
   const [result, setResult] = useState(null);
   const [trackedExplanations, setTrackedExplanations] = useState(new Set());
   const ALL_QUESTIONS = Array.isArray(questions) ? questions : [];
+  const IMAGE_ASSETS = imageAssets || {};
 
   const questionsById = useMemo(() => {
     const map = new Map();
@@ -380,15 +379,13 @@ export default function ResultsSubjectPage({ subject, questions }) {
 
                       {questionParts.map((part, partIndex) => {
                         if (isImageToken(part)) {
-                          const src = imageTokenToSrc(part, basePathPrefix);
                           return (
                             <div key={`q-${partIndex}`} className="question-image">
-                              <Image
-                                src={src}
+                              <QuestionImage
+                                token={part}
+                                asset={IMAGE_ASSETS[part]}
+                                basePathPrefix={basePathPrefix}
                                 alt={`Question ${questionNumber}`}
-                                width={1200}
-                                height={800}
-                                style={{ maxWidth: '100%', height: 'auto' }}
                               />
                             </div>
                           );
@@ -415,15 +412,15 @@ export default function ResultsSubjectPage({ subject, questions }) {
                               <span className={`option-circle${isSelected ? ' option-circle--selected' : ''}`} />
                               {parts.map((part, partIndex) => {
                                 if (isImageToken(part)) {
-                                  const src = imageTokenToSrc(part, basePathPrefix);
                                   return (
                                     <div key={`o-${partIndex}`} className="option-image">
-                                      <Image
-                                        src={src}
+                                      <QuestionImage
+                                        token={part}
+                                        asset={IMAGE_ASSETS[part]}
+                                        basePathPrefix={basePathPrefix}
                                         alt={`Question ${questionNumber} option ${optionIndex + 1}`}
-                                        width={1200}
-                                        height={800}
-                                        style={{ maxWidth: 150, maxHeight: 150, height: 'auto', width: 'auto' }}
+                                        maxWidth={150}
+                                        maxHeight={150}
                                       />
                                     </div>
                                   );
@@ -450,15 +447,13 @@ export default function ResultsSubjectPage({ subject, questions }) {
                           <div className="explanation-content">
                             {Array.isArray(q.explanation) ? q.explanation.map((part, partIndex) => {
                               if (isImageToken(part)) {
-                                const src = imageTokenToSrc(part, basePathPrefix);
                                 return (
                                   <div key={`exp-${partIndex}`} className="question-image">
-                                    <Image
-                                      src={src}
+                                    <QuestionImage
+                                      token={part}
+                                      asset={IMAGE_ASSETS[part]}
+                                      basePathPrefix={basePathPrefix}
                                       alt={`Explanation for question ${questionNumber}`}
-                                      width={1200}
-                                      height={800}
-                                      style={{ maxWidth: '100%', height: 'auto' }}
                                     />
                                   </div>
                                 );
@@ -0,0 +1,582 @@
+// Build stage that cuts the number of image requests a test page makes.
+//
+// Every image token referenced by a question (`images/<name>.<ext>`) is measured
+// (PNG, JPEG, GIF and WebP are recognised by their magic bytes):
+// - files under the inline threshold are embedded as data URIs,
+// - groups of two or more larger PNGs in the same field of one question
+//   (typically the four option diagrams) are packed into a single sprite sheet
+//   with per-token coordinates.
+// Images in any other format are reported and served as-is.
+//
+// The result is written to `data/_image_assets.json` and picked up by
+// `lib/imageAssets.js` from getStaticProps. Sprites land in
+// `public/images/sprites/` and are named after the content hashes of their
+// members, so unchanged groups are never re-encoded; groups whose sheet was
+// rejected as too large are remembered in the manifest and not retried.
+//
+// Inlined images travel in the page data of every page that loads their
+// subject (the mock-test page ships all papers of a subject), so inlining is
+// capped per subject by a total byte budget, smallest images first.
+//
+// Usage: node scripts/build_image_assets.mjs [--inline-max-bytes N] [--inline-budget-bytes N] [--no-sprites]
+import crypto from 'node:crypto';
+import fs from 'node:fs/promises';
+import path from 'node:path';
+import zlib from 'node:zlib';
+
+const root = process.cwd();
+const dataDir = path.join(root, 'data');
+const publicDir = path.join(root, 'public');
+const spriteDir = path.join(publicDir, 'images', 'sprites');
+const manifestPath = path.join(dataDir, '_image_assets.json');
+
+const MANIFEST_VERSION = 2;
+const DEFAULT_INLINE_MAX_BYTES = 4 * 1024;
+// Raw bytes per subject; base64 adds a third. Keeps pages well inside
+// experimental.largePageDataBytes (256 KB) in next.config.mjs.
+const DEFAULT_INLINE_BUDGET_BYTES = 48 * 1024;
+const SPRITE_GAP = 2;
+// Give up on a sprite when it encodes much larger than its members combined.
+const MAX_SPRITE_GROWTH = 1.25;
+const CONTENT_FIELDS = ['question', 'choices', 'explanation'];
+
+const PNG_SIGNATURE = Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]);
+
+function parseArgs(argv) {
+  const options = {
+    inlineMaxBytes: Number(process.env.IMAGE_INLINE_MAX_BYTES) || DEFAULT_INLINE_MAX_BYTES,
+    inlineBudgetBytes: Number(process.env.IMAGE_INLINE_BUDGET_BYTES) || DEFAULT_INLINE_BUDGET_BYTES,
+    sprites: true,
+  };
+  for (let i = 0; i < argv.length; i += 1) {
+    const arg = argv[i];
+    if (arg === '--inline-max-bytes' || arg === '--inline-budget-bytes') {
+      const value = Number(argv[i + 1]);
+      if (!Number.isInteger(value) || value < 0) {
+        throw new Error(`${arg} expects a non-negative integer, got ${argv[i + 1]}`);
+      }
+      options[arg === '--inline-max-bytes' ? 'inlineMaxBytes' : 'inlineBudgetBytes'] = value;
+      i += 1;
+    } else if (arg === '--no-sprites') {
+      options.sprites = false;
+    } else {
+      throw new Error(`Unknown argument: ${arg}`);
+    }
+  }
+  return options;
+}
+
+function isImageToken(token) {
+  return typeof token === 'string' && (token.startsWith('images/') || token.startsWith('image/'));
+}
+
+function imageTokenToPath(token) {
+  const stripped = token.startsWith('image/') ? token.slice('image/'.length) : token;
+  return path.join(publicDir, stripped.replace(/^\/+/, ''));
+}
+
+function sha256(buffer) {
+  return crypto.createHash('sha256').update(buffer).digest('hex');
+}
+
+// ---------------------------------------------------------------------------
+// Minimal PNG codec (non-interlaced, 8-bit gray/RGB/palette/alpha variants).
+// ---------------------------------------------------------------------------
+
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let n = 0; n < 256; n += 1) {
+    let c = n;
+    for (let k = 0; k < 8; k += 1) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    table[n] = c >>> 0;
+  }
+  return table;
+})();
+
+function crc32(buffer) {
+  let c = 0xffffffff;
+  for (let i = 0; i < buffer.length; i += 1) c = CRC_TABLE[(c ^ buffer[i]) & 0xff] ^ (c >>> 8);
+  return (c ^ 0xffffffff) >>> 0;
+}
+
+// Sniffs the format from magic bytes and reads the pixel size from the header.
+// Covers the formats scripts/internal_questions_server.mjs accepts.
+function readImageInfo(buffer) {
+  if (buffer.length >= 24 && buffer.subarray(0, 8).equals(PNG_SIGNATURE)) {
+    return { mime: 'image/png', width: buffer.readUInt32BE(16), height: buffer.readUInt32BE(20) };
+  }
+  if (buffer.length >= 10 && /^GIF8[79]a$/.test(buffer.toString('ascii', 0, 6))) {
+    return { mime: 'image/gif', width: buffer.readUInt16LE(6), height: buffer.readUInt16LE(8) };
+  }
+  if (buffer.length >= 30 && buffer.toString('ascii', 0, 4) === 'RIFF' && buffer.toString('ascii', 8, 12) === 'WEBP') {
+    const chunk = buffer.toString('ascii', 12, 16);
+    if (chunk === 'VP8 ') {
+      return { mime: 'image/webp', width: buffer.readUInt16LE(26) & 0x3fff, height: buffer.readUInt16LE(28) & 0x3fff };
+    }
+    if (chunk === 'VP8L') {
+      const bits = buffer.readUInt32LE(21);
+      return { mime: 'image/webp', width: (bits & 0x3fff) + 1, height: ((bits >>> 14) & 0x3fff) + 1 };
+    }
+    if (chunk === 'VP8X') {
+      return { mime: 'image/webp', width: buffer.readUIntLE(24, 3) + 1, height: buffer.readUIntLE(27, 3) + 1 };
+    }
+    return null;
+  }
+  if (buffer.length >= 4 && buffer[0] === 0xff && buffer[1] === 0xd8) {
+    let offset = 2;
+    while (offset + 9 < buffer.length) {
+      if (buffer[offset] !== 0xff) return null;
+      const marker = buffer[offset + 1];
+      if (marker === 0xff) {
+        offset += 1;
+      } else if (marker === 0x01 || (marker >= 0xd0 && marker <= 0xd9)) {
+        offset += 2;
+      } else if (marker >= 0xc0 && marker <= 0xcf && ![0xc4, 0xc8, 0xcc].includes(marker)) {
+        return { mime: 'image/jpeg', width: buffer.readUInt16BE(offset + 7), height: buffer.readUInt16BE(offset + 5) };
+      } else {
+        offset += 2 + buffer.readUInt16BE(offset + 2);
+      }
+    }
+  }
+  return null;
+}
+
+const CHANNELS = { 0: 1, 2: 3, 3: 1, 4: 2, 6: 4 };
+
+function paeth(a, b, c) {
+  const p = a + b - c;
+  const pa = Math.abs(p - a);
+  const pb = Math.abs(p - b);
+  const pc = Math.abs(p - c);
+  if (pa <= pb && pa <= pc) return a;
+  return pb <= pc ? b : c;
+}
+
+function decodePng(buffer) {
+  if (!buffer.subarray(0, 8).equals(PNG_SIGNATURE)) throw new Error('not a PNG file');
+  let offset = 8;
+  let header = null;
+  let palette = null;
+  let transparency = null;
+  const idat = [];
+  while (offset < buffer.length) {
+    const length = buffer.readUInt32BE(offset);
+    const type = buffer.toString('ascii', offset + 4, offset + 8);
+    const data = buffer.subarray(offset + 8, offset + 8 + length);
+    offset += 12 + length;
+    if (type === 'IHDR') {
+      header = {
+        width: data.readUInt32BE(0),
+        height: data.readUInt32BE(4),
+        bitDepth: data[8],
+        colorType: data[9],
+        interlace: data[12],
+      };
+    } else if (type === 'PLTE') {
+      palette = data;
+    } else if (type === 'tRNS') {
+      transparency = data;
+    } else if (type === 'IDAT') {
+      idat.push(data);
+    } else if (type === 'IEND') {
+      break;
+    }
+  }
+  if (!header) throw new Error('missing IHDR chunk');
+  const { width, height, bitDepth, colorType, interlace } = header;
+  const channels = CHANNELS[colorType];
+  if (bitDepth !== 8 || !channels || interlace !== 0) {
+    throw new Error(`unsupported PNG layout (bitDepth=${bitDepth}, colorType=${colorType}, interlace=${interlace})`);
+  }
+  if (colorType === 3 && !palette) throw new Error('palette PNG without PLTE chunk');
+
+  const raw = zlib.inflateSync(Buffer.concat(idat));
+  const stride = width * channels;
+  const pixels = Buffer.alloc(width * height * channels);
+  for (let y = 0; y < height; y += 1) {
+    const filter = raw[y * (stride + 1)];
+    const line = raw.subarray(y * (stride + 1) + 1, (y + 1) * (stride + 1));
+    const out = y * stride;
+    const prev = out - stride;
+    for (let x = 0; x < stride; x += 1) {
+      const a = x >= channels ? pixels[out + x - channels] : 0;
+      const b = y > 0 ? pixels[prev + x] : 0;
+      const c = x >= channels && y > 0 ? pixels[prev + x - channels] : 0;
+      let value = line[x];
+      if (filter === 1) value += a;
+      else if (filter === 2) value += b;
+      else if (filter === 3) value += (a + b) >> 1;
+      else if (filter === 4) value += paeth(a, b, c);
+      else if (filter !== 0) throw new Error(`invalid filter type ${filter}`);
+      pixels[out + x] = value & 0xff;
+    }
+  }
+
+  const rgba = Buffer.alloc(width * height * 4);
+  for (let i = 0, j = 0; i < width * height; i += 1, j += channels) {
+    const o = i * 4;
+    if (colorType === 6) {
+      pixels.copy(rgba, o, j, j + 4);
+    } else if (colorType === 2) {
+      rgba[o] = pixels[j];
+      rgba[o + 1] = pixels[j + 1];
+      rgba[o + 2] = pixels[j + 2];
+      rgba[o + 3] = 255;
+    } else if (colorType === 3) {
+      const index = pixels[j];
+      rgba[o] = palette[index * 3];
+      rgba[o + 1] = palette[index * 3 + 1];
+      rgba[o + 2] = palette[index * 3 + 2];
+      rgba[o + 3] = transparency && index < transparency.length ? transparency[index] : 255;
+    } else {
+      rgba[o] = pixels[j];
+      rgba[o + 1] = pixels[j];
+      rgba[o + 2] = pixels[j];
+      rgba[o + 3] = colorType === 4 ? pixels[j + 1] : 255;
+    }
+  }
+  return { width, height, rgba };
+}
+
+function pngChunk(type, data) {
+  const length = Buffer.alloc(4);
+  length.writeUInt32BE(data.length);
+  const body = Buffer.concat([Buffer.from(type, 'ascii'), data]);
+  const crc = Buffer.alloc(4);
+  crc.writeUInt32BE(crc32(body));
+  return Buffer.concat([length, body, crc]);
+}
+
+// Encodes RGBA pixels, choosing the filter per scanline with the usual
+// minimum-sum-of-absolute-differences heuristic.
+function encodePng({ width, height, rgba }) {
+  const stride = width * 4;
+  const raw = Buffer.alloc(height * (stride + 1));
+  const candidate = Buffer.alloc(stride);
+  const best = Buffer.alloc(stride);
+  for (let y = 0; y < height; y += 1) {
+    const row = y * stride;
+    const prev = row - stride;
+    let bestFilter = 0;
+    let bestScore = Infinity;
+    for (let filter = 0; filter <= 4; filter += 1) {
+      let score = 0;
+      for (let x = 0; x < stride; x += 1) {
+        const a = x >= 4 ? rgba[row + x - 4] : 0;
+        const b = y > 0 ? rgba[prev + x] : 0;
+        const c = x >= 4 && y > 0 ? rgba[prev + x - 4] : 0;
+        let predictor = 0;
+        if (filter === 1) predictor = a;
+        else if (filter === 2) predictor = b;
+        else if (filter === 3) predictor = (a + b) >> 1;
+        else if (filter === 4) predictor = paeth(a, b, c);
+        const value = (rgba[row + x] - predictor) & 0xff;
+        candidate[x] = value;
+        score += value < 128 ? value : 256 - value;
+      }
+      if (score < bestScore) {
+        bestScore = score;
+        bestFilter = filter;
+        candidate.copy(best);
+      }
+    }
+    raw[y * (stride + 1)] = bestFilter;
+    best.copy(raw, y * (stride + 1) + 1);
+  }
+
+  const header = Buffer.alloc(13);
+  header.writeUInt32BE(width, 0);
+  header.writeUInt32BE(height, 4);
+  header[8] = 8;
+  header[9] = 6;
+  return Buffer.concat([
+    PNG_SIGNATURE,
+    pngChunk('IHDR', header),
+    pngChunk('IDAT', zlib.deflateSync(raw, { level: 9 })),
+    pngChunk('IEND', Buffer.alloc(0)),
+  ]);
+}
+
+// ---------------------------------------------------------------------------
+// Sprite packing
+// ---------------------------------------------------------------------------
+
+// Rows of up to two images keep sheets roughly square for four-option sets.
+function layoutSprite(members) {
+  const columns = members.length > 2 ? 2 : members.length;
+  const frames = [];
+  let y = 0;
+  let sheetWidth = 0;
+  for (let start = 0; start < members.length; start += columns) {
+    const row = members.slice(start, start + columns);
+    let x = 0;
+    let rowHeight = 0;
+    row.forEach((member) => {
+      frames.push({ token: member.token, x, y, width: member.width, height: member.height });
+      x += member.width + SPRITE_GAP;
+      rowHeight = Math.max(rowHeight, member.height);
+    });
+    sheetWidth = Math.max(sheetWidth, x - SPRITE_GAP);
+    y += rowHeight + SPRITE_GAP;
+  }
+  return { width: sheetWidth, height: y - SPRITE_GAP, frames };
+}
+
+async function buildSprite(members, fileName) {
+  const layout = layoutSprite(members);
+  const sheet = Buffer.alloc(layout.width * layout.height * 4);
+  for (const frame of layout.frames) {
+    const member = members.find((m) => m.token === frame.token);
+    const image = decodePng(await fs.readFile(member.filePath));
+    for (let row = 0; row < image.height; row += 1) {
+      image.rgba.copy(
+        sheet,
+        ((frame.y + row) * layout.width + frame.x) * 4,
+        row * image.width * 4,
+        (row + 1) * image.width * 4,
+      );
+    }
+  }
+  const encoded = encodePng({ width: layout.width, height: layout.height, rgba: sheet });
+  // Write then rename so an interrupted build never leaves a truncated sheet
+  // under its content-keyed name, where later builds would reuse it.
+  const tmpPath = path.join(spriteDir, `${fileName}.${process.pid}.tmp`);
+  await fs.writeFile(tmpPath, encoded);
+  await fs.rename(tmpPath, path.join(spriteDir, fileName));
+  return { layout, bytes: encoded.length };
+}
+
+// ---------------------------------------------------------------------------
+// Corpus scan
+// ---------------------------------------------------------------------------
+
+async function readPreviousManifest() {
+  try {
+    const manifest = JSON.parse(await fs.readFile(manifestPath, 'utf-8'));
+    return manifest.version === MANIFEST_VERSION ? manifest : null;
+  } catch {
+    return null;
+  }
+}
+
+async function exists(p) {
+  try {
+    await fs.access(p);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+// Yields { subject, questionId, field, tokens } for every field that references images.
+async function collectImageGroups() {
+  const groups = [];
+  const subjects = (await fs.readdir(dataDir, { withFileTypes: true }))
+    .filter((entry) => entry.isDirectory())
+    .map((entry) => entry.name)
+    .sort();
+  for (const subject of subjects) {
+    const files = (await fs.readdir(path.join(dataDir, subject)))
+      .filter((name) => name.endsWith('.json'))
+      .sort();
+    for (const file of files) {
+      const question = JSON.parse(await fs.readFile(path.join(dataDir, subject, file), 'utf-8'));
+      for (const field of CONTENT_FIELDS) {
+        const value = Array.isArray(question[field]) ? question[field] : [];
+        const parts = field === 'choices' ? value.flatMap((c) => (Array.isArray(c) ? c : [])) : value;
+        const tokens = [...new Set(parts.filter(isImageToken))];
+        if (tokens.length > 0) groups.push({ subject, questionId: question.id, field, tokens });
+      }
+    }
+  }
+  return groups;
+}
+
+async function measureImage(token, previousFiles) {
+  const filePath = imageTokenToPath(token);
+  let buffer;
+  try {
+    buffer = await fs.readFile(filePath);
+  } catch {
+    return null;
+  }
+  const hash = sha256(buffer);
+  const cached = previousFiles?.[token];
+  const image = cached && cached.hash === hash ? cached : readImageInfo(buffer);
+  return {
+    token,
+    filePath,
+    buffer,
+    hash,
+    bytes: buffer.length,
+    mime: image?.mime ?? null,
+    width: image?.width ?? null,
+    height: image?.height ?? null,
+  };
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  const previous = await readPreviousManifest();
+  const groups = await collectImageGroups();
+
+  const files = {};
+  const assets = {};
+  const missing = new Set();
+  const measured = new Map();
+  let spritesBuilt = 0;
+  let spritesReused = 0;
+
+  for (const group of groups) {
+    for (const token of group.tokens) {
+      if (measured.has(token) || missing.has(token)) continue;
+      const info = await measureImage(token, previous?.files);
+      if (!info) {
+        missing.add(token);
+        continue;
+      }
+      if (!info.mime || !info.width || !info.height) {
+        console.warn(`Unsupported or unreadable image format, serving as-is: ${token}`);
+      }
+      measured.set(token, info);
+      files[token] = { hash: info.hash, bytes: info.bytes, mime: info.mime, width: info.width, height: info.height };
+    }
+  }
+
+  const tokenSubjects = new Map();
+  groups.forEach((group) => {
+    group.tokens.forEach((token) => {
+      if (!tokenSubjects.has(token)) tokenSubjects.set(token, new Set());
+      tokenSubjects.get(token).add(group.subject);
+    });
+  });
+  const inlineBytes = {};
+  const overBudget = [];
+  const inlineCandidates = [...measured.values()]
+    .filter((info) => info.bytes <= options.inlineMaxBytes && info.mime && info.width && info.height)
+    .sort((a, b) => a.bytes - b.bytes || a.token.localeCompare(b.token));
+  for (const info of inlineCandidates) {
+    const subjects = [...tokenSubjects.get(info.token)];
+    if (subjects.some((subject) => (inlineBytes[subject] ?? 0) + info.bytes > options.inlineBudgetBytes)) {
+      overBudget.push(info.token);
+      continue;
+    }
+    subjects.forEach((subject) => {
+      inlineBytes[subject] = (inlineBytes[subject] ?? 0) + info.bytes;
+    });
+    assets[info.token] = {
+      type: 'inline',
+      src: `data:${info.mime};base64,${info.buffer.toString('base64')}`,
+      width: info.width,
+      height: info.height,
+    };
+  }
+  if (overBudget.length > 0) {
+    console.warn(
+      `Inline budget of ${options.inlineBudgetBytes} bytes per subject reached; ` +
+        `${overBudget.length} small images left as files (e.g. ${overBudget[0]}).`,
+    );
+  }
+
+  const usedSprites = new Set();
+  const rejectedSprites = {};
+  let spritesRejected = 0;
+  if (options.sprites) {
+    await fs.mkdir(spriteDir, { recursive: true });
+    for (const group of groups) {
+      // Tokens already inlined or claimed by an earlier group keep that entry,
+      // so a sheet never ships with frames nobody renders.
+      const members = group.tokens
+        .filter((token) => !assets[token])
+        .map((token) => measured.get(token))
+        .filter((info) => info && info.mime === 'image/png' && info.width && info.height);
+      if (members.length < 2) continue;
+
+      const key = sha256(
+        Buffer.from(JSON.stringify([MANIFEST_VERSION, SPRITE_GAP, members.map((m) => [m.token, m.hash])])),
+      );
+      const fileName = `${key.slice(0, 16)}.png`;
+      const spritePath = path.join(spriteDir, fileName);
+      const layout = layoutSprite(members);
+      const memberBytes = members.reduce((sum, m) => sum + m.bytes, 0);
+      const knownRejection = previous?.rejectedSprites?.[fileName];
+      if (knownRejection) {
+        rejectedSprites[fileName] = knownRejection;
+        spritesRejected += 1;
+        continue;
+      }
+
+      let spriteBytes;
+      let cached = false;
+      if (await exists(spritePath)) {
+        spriteBytes = (await fs.stat(spritePath)).size;
+        cached = true;
+      } else {
+        try {
+          spriteBytes = (await buildSprite(members, fileName)).bytes;
+        } catch (error) {
+          console.warn(`Skipping sprite for ${group.questionId} ${group.field}: ${error.message}`);
+          continue;
+        }
+      }
+
+      if (spriteBytes > memberBytes * MAX_SPRITE_GROWTH) {
+        console.warn(
+          `Skipping sprite for ${group.questionId} ${group.field}: ${spriteBytes} bytes vs ${memberBytes} bytes separately`,
+        );
+        rejectedSprites[fileName] = { spriteBytes, memberBytes };
+        spritesRejected += 1;
+        continue;
+      }
+
+      if (cached) spritesReused += 1;
+      else spritesBuilt += 1;
+      usedSprites.add(fileName);
+      layout.frames.forEach((frame) => {
+        assets[frame.token] = {
+          type: 'sprite',
+          src: `images/sprites/${fileName}`,
+          x: frame.x,
+          y: frame.y,
+          width: frame.width,
+          height: frame.height,
+          sheetWidth: layout.width,
+          sheetHeight: layout.height,
+        };
+      });
+    }
+
+    // Drop sheets left over from earlier runs (and temp files from interrupted
+    // ones) so they are not exported.
+    for (const name of await fs.readdir(spriteDir)) {
+      if ((name.endsWith('.png') && !usedSprites.has(name)) || name.endsWith('.tmp')) {
+        await fs.rm(path.join(spriteDir, name));
+      }
+    }
+  }
+
+  const manifest = {
+    version: MANIFEST_VERSION,
+    inlineMaxBytes: options.inlineMaxBytes,
+    inlineBudgetBytes: options.inlineBudgetBytes,
+    inlineBytes,
+    files,
+    rejectedSprites,
+    assets,
+  };
+  await fs.writeFile(manifestPath, `${JSON.stringify(manifest, null, 2)}\n`);
+
+  const inlined = Object.values(assets).filter((a) => a.type === 'inline').length;
+  const sprited = Object.values(assets).filter((a) => a.type === 'sprite').length;
+  console.log(
+    `Image assets: ${measured.size} images measured, ${inlined} inlined, ` +
+      `${sprited} packed into ${usedSprites.size} sprites (${spritesBuilt} built, ${spritesReused} cached, ` +
+      `${spritesRejected} rejected as too large), ` +
+      `${missing.size} referenced files missing.`,
+  );
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
@@ -49,6 +49,9 @@ try {
     moved = true;
   }
 
+  // Inline small images and sprite option sets before pages read the manifest.
+  await run(process.execPath, [path.join(root, 'scripts', 'build_image_assets.mjs')], env);
+
   const nextBin = path.join(root, 'node_modules', '.bin', 'next');
   await run(nextBin, ['build'], env);
 } finally {
@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Load-test harness that replays mock-test sessions against the static export.
+
+Serves ./out locally under the /fe-web basePath (as GitHub Pages does) and
+simulates concurrent students. Each session:
+  1. opens /mock-test/<subject>?year=<year> and fetches the page's _next assets,
+  2. picks the same questions the page would (year paper or random 60) and
+     fetches every image they reference, honouring the inline/sprite manifest,
+  3. navigates client-side to /results/<subject>: page data, the route's
+     JS/CSS chunks not already loaded, and explanation images.
+Resources already fetched in a session are treated as browser-cached.
+
+Reports bytes and requests per session, p50/p95 latency and throughput for
+each concurrency level, optionally as JSON for tracking across builds.
+
+Usage: python scripts/load_test.py [--out out] [--concurrency 1 8 32] [--sessions 50] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import gzip
+import html
+import json
+import mimetypes
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+
+DEFAULT_BASE_PATH = '/fe-web'
+SUBJECTS = ['bio', 'phy', 'chem', 'mat']
+QUESTION_COUNT = 60
+# Browsers open up to six connections per host.
+DEFAULT_CONNECTIONS_PER_SESSION = 6
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__" type="application/json"[^>]*>(.*?)</script>', re.S)
+TAG_RE = re.compile(r'<(script|link)\b([^>]*)>', re.I)
+ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*"([^"]*)")?')
+# <link> rels a browser actually downloads; prefetch hints are left out.
+FETCHED_LINK_RELS = {'stylesheet', 'preload', 'modulepreload'}
+
+
+# ---------------------------------------------------------------------------
+# Static server
+# ---------------------------------------------------------------------------
+
+class StaticServer:
+    """Minimal keep-alive HTTP/1.1 server for a Next static export."""
+
+    def __init__(self, root, base_path):
+        self.root = Path(root).resolve()
+        self.base_path = base_path.rstrip('/')
+        self.cache = {}
+        self.server = None
+
+    def resolve(self, url_path):
+        path = unquote(urlsplit(url_path).path)
+        if self.base_path:
+            if path != self.base_path and not path.startswith(self.base_path + '/'):
+                return None
+            path = path[len(self.base_path):]
+        relative = path.lstrip('/')
+        candidates = [relative, f'{relative}.html', f'{relative}/index.html'] if relative else ['index.html']
+        for candidate in candidates:
+            file_path = (self.root / candidate).resolve()
+            if file_path.is_file() and file_path.is_relative_to(self.root):
+                return file_path
+        return None
+
+    def load(self, file_path, accept_gzip):
+        key = (file_path, accept_gzip)
+        if key not in self.cache:
+            body = file_path.read_bytes()
+            content_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+            encoding = None
+            if accept_gzip and content_type.startswith(COMPRESSIBLE_TYPES):
+                body = gzip.compress(body, compresslevel=6)
+                encoding = 'gzip'
+            self.cache[key] = (body, content_type, encoding)
+        return self.cache[key]
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                accept_gzip = 'gzip' in headers.get('accept-encoding', '')
+                file_path = self.resolve(target) if method in ('GET', 'HEAD') else None
+                if file_path is None:
+                    not_found = self.root / '404.html'
+                    status = '404 Not Found'
+                    body, content_type, encoding = (
+                        self.load(not_found, accept_gzip) if not_found.is_file() else (b'Not Found', 'text/plain', None)
+                    )
+                else:
+                    status = '200 OK'
+                    body, content_type, encoding = self.load(file_path, accept_gzip)
+
+                lines = [
+                    f'HTTP/1.1 {status}',
+                    f'Content-Type: {content_type}',
+                    f'Content-Length: {len(body)}',
+                ]
+                if encoding:
+                    lines.append(f'Content-Encoding: {encoding}')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                lines.append('Connection: keep-alive' if keep_alive else 'Connection: close')
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection; counts bytes as received on the wire."""
+
+    def __init__(self, host, port, accept_gzip, use_tls=False):
+        self.host = host
+        self.port = port
+        self.accept_gzip = accept_gzip
+        self.use_tls = use_tls
+        default_port = 443 if use_tls else 80
+        self.host_header = host if port == default_port else f'{host}:{port}'
+        self.reader = None
+        self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=True if self.use_tls else None
+            )
+        request = [f'GET {path} HTTP/1.1', f'Host: {self.host_header}', 'Connection: keep-alive']
+        if self.accept_gzip:
+            request.append('Accept-Encoding: gzip')
+        self.writer.write(('\r\n'.join(request) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed by server')
+        status = int(status_line.split()[1])
+        header_bytes = len(status_line)
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            header_bytes += len(line)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b''.join(chunks)
+        else:
+            body = await self.reader.read()
+            headers['connection'] = 'close'
+
+        wire_bytes = header_bytes + len(body)
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        if headers.get('content-encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return status, body, wire_bytes
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def classify(path, base_path):
+    path = urlsplit(path).path[len(base_path):]
+    if path.startswith('/_next/data/'):
+        return 'data'
+    if path.startswith('/_next/'):
+        return 'static'
+    if path.startswith('/images/'):
+        return 'image'
+    return 'html'
+
+
+class Session:
+    """A simulated student: a small connection pool plus a browser-style cache."""
+
+    def __init__(self, host, port, base_path, connections, accept_gzip, use_tls=False):
+        self.base_path = base_path
+        self.pool = asyncio.Queue()
+        for _ in range(connections):
+            self.pool.put_nowait(HttpConnection(host, port, accept_gzip, use_tls))
+        self.cache = {}
+        self.requests = []
+        self.errors = []
+
+    async def fetch(self, path, allow_missing=False):
+        if path in self.cache:
+            return self.cache[path]
+        connection = await self.pool.get()
+        started = time.perf_counter()
+        try:
+            status, body, wire_bytes = await connection.get(path)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError) as e:
+            connection.close()
+            self.errors.append(f'{path}: {e}')
+            return 0, b''
+        finally:
+            self.pool.put_nowait(connection)
+        self.requests.append({
+            'path': path,
+            'kind': classify(path, self.base_path),
+            'status': status,
+            'bytes': wire_bytes,
+            'latency': time.perf_counter() - started,
+        })
+        if status >= 400 and not (allow_missing and status == 404):
+            self.errors.append(f'{path}: HTTP {status}')
+        self.cache[path] = (status, body)
+        return status, body
+
+    async def fetch_all(self, paths):
+        return await asyncio.gather(*(self.fetch(p) for p in dict.fromkeys(paths)))
+
+    def close(self):
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+
+# ---------------------------------------------------------------------------
+# Page model
+# ---------------------------------------------------------------------------
+
+def parse_page(html_bytes, base_path):
+    """Return (__NEXT_DATA__, list of _next asset paths) for an exported page."""
+    text = html_bytes.decode('utf-8', errors='replace')
+    match = NEXT_DATA_RE.search(text)
+    next_data = json.loads(html.unescape(match.group(1))) if match else {}
+    prefix = f'{base_path}/_next/'
+    assets = []
+    for tag, attr_text in TAG_RE.findall(text):
+        attrs = {name.lower(): html.unescape(value) for name, value in ATTR_RE.findall(attr_text)}
+        if tag.lower() == 'script':
+            # Modern browsers skip the <script noModule> polyfills chunk.
+            if 'nomodule' in attrs:
+                continue
+            url = attrs.get('src', '')
+        else:
+            if not FETCHED_LINK_RELS & set(attrs.get('rel', '').lower().split()):
+                continue
+            url = attrs.get('href', '')
+        if url.startswith(prefix):
+            assets.append(url)
+    return next_data, assets
+
+
+def is_image_token(token):
+    return isinstance(token, str) and (token.startswith('images/') or token.startswith('image/'))
+
+
+def image_urls(questions, fields, image_assets, base_path):
+    """URLs a browser requests to render the given fields of these questions."""
+    urls = []
+    for q in questions:
+        for field in fields:
+            value = q.get(field) if isinstance(q.get(field), list) else []
+            parts = [p for c in value if isinstance(c, list) for p in c] if field == 'choices' else value
+            for token in filter(is_image_token, parts):
+                asset = image_assets.get(token)
+                if asset and asset.get('type') == 'inline':
+                    continue
+                src = asset['src'] if asset else token
+                if src.startswith('image/'):
+                    src = src[len('image/'):]
+                urls.append(f"{base_path}/{src.lstrip('/')}")
+    return urls
+
+
+def select_question_ids(props, year, rng):
+    """Mirror the selection in pages/mock-test/[subject].js."""
+    if year == 'random':
+        ids = props.get('allIds') or []
+        return rng.sample(ids, min(QUESTION_COUNT, len(ids)))
+    ids = (props.get('yearIdsMap') or {}).get(str(year)) or []
+    return ids[:QUESTION_COUNT]
+
+
+async def discover_site(host, port, base_path, subjects, use_tls=False):
+    """Fetch each subject's pages once (unmeasured).
+
+    Returns the paper years per subject and the _next chunks the results
+    route needs, which a client-side navigation loads alongside page data.
+    """
+    session = Session(host, port, base_path, 1, False, use_tls)
+    years = {}
+    results_assets = {}
+    try:
+        for subject in subjects:
+            status, body = await session.fetch(f'{base_path}/mock-test/{subject}')
+            if status != 200:
+                raise RuntimeError(f'mock-test page for {subject} returned HTTP {status}')
+            next_data, _ = parse_page(body, base_path)
+            props = next_data.get('props', {}).get('pageProps', {})
+            years[subject] = list(props.get('availableYears') or []) + ['random']
+
+            status, body = await session.fetch(f'{base_path}/results/{subject}')
+            results_assets[subject] = parse_page(body, base_path)[1] if status == 200 else []
+    finally:
+        session.close()
+    return years, results_assets
+
+
+async def run_session(host, port, args, site, rng):
+    years, results_assets = site
+    base = args.base_path
+    session = Session(host, port, base, args.connections, not args.no_gzip, args.tls)
+    subject = rng.choice(args.subjects)
+    year = rng.choice(years[subject])
+    started = time.perf_counter()
+    try:
+        # 1. Mock test page: HTML, its _next assets, then question/option images.
+        _, body = await session.fetch(f'{base}/mock-test/{subject}?year={year}')
+        next_data, assets = parse_page(body, base)
+        await session.fetch_all(assets)
+        props = next_data.get('props', {}).get('pageProps', {})
+        by_id = {q.get('id'): q for q in props.get('questions') or []}
+        selected_ids = select_question_ids(props, year, rng)
+        questions = [by_id[i] for i in selected_ids if i in by_id]
+        await session.fetch_all(image_urls(questions, ('question', 'choices'), props.get('imageAssets') or {}, base))
+
+        # 2. Results page via client-side navigation: page data JSON plus the
+        # route's chunks (already-loaded shared chunks hit the session cache).
+        # Falls back to a full page load when the export has no data file.
+        build_id = next_data.get('buildId')
+        status, body = (404, b'')
+        if build_id:
+            status, body = await session.fetch(
+                f'{base}/_next/data/{build_id}/results/{subject}.json', allow_missing=True
+            )
+        if status == 200:
+            await session.fetch_all(results_assets[subject])
+            results_props = json.loads(body).get('pageProps', {})
+        else:
+            _, body = await session.fetch(f'{base}/results/{subject}?year={year}')
+            results_data, assets = parse_page(body, base)
+            await session.fetch_all(assets)
+            results_props = results_data.get('props', {}).get('pageProps', {})
+        by_id = {q.get('id'): q for q in results_props.get('questions') or []}
+        questions = [by_id[i] for i in selected_ids if i in by_id]
+        await session.fetch_all(
+            image_urls(questions, ('question', 'choices', 'explanation'), results_props.get('imageAssets') or {}, base)
+        )
+    finally:
+        session.close()
+    return {
+        'subject': subject,
+        'year': year,
+        'duration': time.perf_counter() - started,
+        'requests': session.requests,
+        'errors': session.errors,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def distribution(values, scale=1.0, digits=1):
+    return {
+        'mean': round(sum(values) / len(values) * scale, digits) if values else 0.0,
+        'p50': round(percentile(values, 50) * scale, digits),
+        'p95': round(percentile(values, 95) * scale, digits),
+        'max': round(max(values) * scale, digits) if values else 0.0,
+    }
+
+
+def summarize(concurrency, sessions, elapsed):
+    requests = [r for s in sessions for r in s['requests']]
+    total_bytes = sum(r['bytes'] for r in requests)
+    by_kind = {}
+    for r in requests:
+        kind = by_kind.setdefault(r['kind'], {'requests': 0, 'bytes': 0, 'latencies': []})
+        kind['requests'] += 1
+        kind['bytes'] += r['bytes']
+        kind['latencies'].append(r['latency'])
+    errors = [e for s in sessions for e in s['errors']]
+    return {
+        'concurrency': concurrency,
+        'sessions': len(sessions),
+        'elapsed_s': round(elapsed, 3),
+        'throughput': {
+            'sessions_per_s': round(len(sessions) / elapsed, 2) if elapsed else 0.0,
+            'requests_per_s': round(len(requests) / elapsed, 2) if elapsed else 0.0,
+            'bytes_per_s': round(total_bytes / elapsed) if elapsed else 0,
+        },
+        'session_bytes': distribution([sum(r['bytes'] for r in s['requests']) for s in sessions], digits=0),
+        'session_requests': distribution([len(s['requests']) for s in sessions]),
+        'session_duration_ms': distribution([s['duration'] for s in sessions], scale=1000),
+        'request_latency_ms': distribution([r['latency'] for r in requests], scale=1000),
+        'by_kind': {
+            name: {
+                'requests_per_session': round(kind['requests'] / len(sessions), 2),
+                'bytes_per_session': round(kind['bytes'] / len(sessions)),
+                'latency_ms': distribution(kind['latencies'], scale=1000),
+            }
+            for name, kind in sorted(by_kind.items())
+        },
+        'errors': {'count': len(errors), 'sample': errors[:10]},
+    }
+
+
+def print_summary(result):
+    print(f"\nConcurrency {result['concurrency']}: {result['sessions']} sessions in {result['elapsed_s']}s")
+    t = result['throughput']
+    print(f"  throughput     {t['sessions_per_s']} sessions/s, {t['requests_per_s']} req/s, "
+          f"{t['bytes_per_s'] / 1024 / 1024:.2f} MiB/s")
+    b = result['session_bytes']
+    print(f"  bytes/session  mean {b['mean'] / 1024:.1f} KiB, p50 {b['p50'] / 1024:.1f} KiB, "
+          f"p95 {b['p95'] / 1024:.1f} KiB")
+    r = result['session_requests']
+    print(f"  reqs/session   mean {r['mean']}, p50 {r['p50']}, p95 {r['p95']}")
+    d = result['session_duration_ms']
+    print(f"  session time   p50 {d['p50']} ms, p95 {d['p95']} ms")
+    lat = result['request_latency_ms']
+    print(f"  request time   p50 {lat['p50']} ms, p95 {lat['p95']} ms")
+    for name, kind in result['by_kind'].items():
+        print(f"    {name:<7} {kind['requests_per_session']:>6} req  {kind['bytes_per_session'] / 1024:>9.1f} KiB  "
+              f"p95 {kind['latency_ms']['p95']} ms")
+    if result['errors']['count']:
+        print(f"  errors         {result['errors']['count']} (e.g. {result['errors']['sample'][0]})")
+
+
+async def run_level(host, port, args, site, concurrency, session_seeds):
+    queue = asyncio.Queue()
+    for seed in session_seeds:
+        queue.put_nowait(random.Random(seed))
+    results = []
+
+    async def student():
+        while not queue.empty():
+            session_rng = queue.get_nowait()
+            results.append(await run_session(host, port, args, site, session_rng))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(student() for _ in range(concurrency)))
+    return summarize(concurrency, results, time.perf_counter() - started)
+
+
+async def main_async(args):
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or (443 if args.tls else 80)
+    else:
+        out_dir = Path(args.out)
+        if not (out_dir / 'index.html').is_file():
+            print(f"Error: '{out_dir}' does not look like a static export (run `npm run build` first)")
+            sys.exit(1)
+        server = StaticServer(out_dir, args.base_path)
+        host, port = '127.0.0.1', await server.start()
+        print(f"Serving {out_dir} at http://{host}:{port}{args.base_path}/")
+
+    # Every level replays the same sessions, so per-session figures compare
+    # across levels and only the concurrency differs.
+    rng = random.Random(args.seed)
+    session_seeds = [rng.random() for _ in range(args.sessions)]
+    try:
+        site = await discover_site(host, port, args.base_path, args.subjects, args.tls)
+        levels = [await run_level(host, port, args, site, c, session_seeds) for c in args.concurrency]
+    finally:
+        if server:
+            await server.stop()
+
+    for level in levels:
+        print_summary(level)
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'target': args.url or str(Path(args.out).resolve()),
+        'base_path': args.base_path,
+        'subjects': args.subjects,
+        'sessions_per_level': args.sessions,
+        'connections_per_session': args.connections,
+        'gzip': not args.no_gzip,
+        'seed': args.seed,
+        'levels': levels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay simulated mock-test sessions against the static export',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build, then measure 50 sessions at 1, 8 and 32 concurrent students
+  npm run build
+  python scripts/load_test.py --concurrency 1 8 32 --sessions 50
+  # Physics only, save JSON for comparison across builds
+  python scripts/load_test.py --subjects phy --json load-phy.json
+        """
+    )
+    parser.add_argument('--out', default='out', help='Static export directory to serve (default: out)')
+    parser.add_argument('--url', help='Test an already running http(s) server instead, e.g. http://localhost:8080 '
+                                      'or https://example.github.io/fe-web (a URL path sets the basePath)')
+    parser.add_argument('--base-path',
+                        help=f'basePath the export was built with (default: {DEFAULT_BASE_PATH})')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32],
+                        help='Concurrent students per level (default: 1 8 32)')
+    parser.add_argument('--sessions', type=int, default=50, help='Sessions per concurrency level (default: 50)')
+    parser.add_argument('--subjects', nargs='+', choices=SUBJECTS, default=SUBJECTS,
+                        help='Subjects to pick from (default: all)')
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS_PER_SESSION,
+                        help=f'Connections per session (default: {DEFAULT_CONNECTIONS_PER_SESSION})')
+    parser.add_argument('--no-gzip', action='store_true', help='Do not request gzip-compressed responses')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for subject/year/question choice')
+    parser.add_argument('--json', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+    if min(args.concurrency) < 1:
+        parser.error('--concurrency values must be at least 1')
+    if args.sessions < 1:
+        parser.error('--sessions must be at least 1')
+    if args.connections < 1:
+        parser.error('--connections must be at least 1')
+    args.tls = False
+    if args.url:
+        target = urlsplit(args.url)
+        if target.scheme not in ('http', 'https') or not target.hostname:
+            parser.error('--url must be an http:// or https:// URL with a host')
+        if target.query or target.fragment:
+            parser.error('--url must not contain a query string or fragment')
+        args.tls = target.scheme == 'https'
+        url_path = target.path.rstrip('/')
+        if url_path:
+            if args.base_path is not None and args.base_path.strip('/') != url_path.strip('/'):
+                parser.error(f'--base-path {args.base_path} conflicts with the --url path {url_path}')
+            args.base_path = url_path
+    if args.base_path is None:
+        args.base_path = DEFAULT_BASE_PATH
+    args.base_path = '/' + args.base_path.strip('/') if args.base_path.strip('/') else ''
+
+    report = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Columnar metadata export of the question corpus for fast bulk queries.
+
+Flattens per-question metadata from data/<subject>/*.json into NumPy arrays
+stored in a single .npz file. Re-running `build` only re-parses files whose
+size or mtime changed and leaves the file untouched when nothing did, so
+refreshing after an edit is cheap. `query` and `report` then answer
+corpus-wide questions from the arrays alone.
+
+Columns (one row per question file):
+  id, subject, path, mtime_ns, size
+  years                  int16 [n, k], 0-padded list of years
+  correct_answer         int8, -1 when missing
+  num_choices            int8
+  <field>_chars          int32, text length excluding image tokens
+  <field>_images         int16, image token count
+  <field>_katex          int16, <katex> span count
+  has_explanation        bool
+where <field> is question, choices or explanation.
+
+Usage:
+  python scripts/question_metadata.py build [--data-dir data] [--output data/_question_metadata.npz]
+  python scripts/question_metadata.py query --subject chem --year 2024 --images-in choices
+  python scripts/question_metadata.py report [--subject phy]
+Default paths are relative to the repository root, not the working directory.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DATA_DIR = str(REPO_ROOT / 'data')
+DEFAULT_OUTPUT = str(REPO_ROOT / 'data' / '_question_metadata.npz')
+CONTENT_FIELDS = ['question', 'choices', 'explanation']
+KATEX_RE = re.compile(r'<katex>')
+# A paper is flagged when one answer index takes this share of its questions.
+SKEW_THRESHOLD = 0.4
+
+
+def is_image_token(part):
+    return isinstance(part, str) and (part.startswith('images/') or part.startswith('image/'))
+
+
+def field_parts(question, field):
+    """Flatten a content field into its string parts (choices are nested)."""
+    value = question.get(field)
+    if not isinstance(value, list):
+        return [value] if isinstance(value, str) else []
+    if field == 'choices':
+        return [p for choice in value if isinstance(choice, list) for p in choice if isinstance(p, str)]
+    return [p for p in value if isinstance(p, str)]
+
+
+def extract_row(file_path, subject, stat):
+    """Read one question file and return its metadata as a dict of scalars."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        question = json.load(f)
+
+    years = question.get('years')
+    if not isinstance(years, list):
+        years = []
+    correct = question.get('correctAnswer')
+    choices = question.get('choices')
+
+    row = {
+        'id': str(question.get('id') or file_path.stem),
+        'subject': subject,
+        'path': str(file_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'years': [int(y) for y in years if isinstance(y, int)],
+        'correct_answer': correct if isinstance(correct, int) and not isinstance(correct, bool) else -1,
+        'num_choices': len(choices) if isinstance(choices, list) else 0,
+    }
+    for field in CONTENT_FIELDS:
+        parts = field_parts(question, field)
+        text = [p for p in parts if not is_image_token(p)]
+        row[f'{field}_chars'] = sum(len(p) for p in text)
+        row[f'{field}_images'] = len(parts) - len(text)
+        row[f'{field}_katex'] = sum(len(KATEX_RE.findall(p)) for p in text)
+    row['has_explanation'] = any(p.strip() for p in field_parts(question, 'explanation'))
+    return row
+
+
+def rows_to_columns(rows):
+    """Pack row dicts into the typed column arrays stored in the .npz."""
+    width = max([len(r['years']) for r in rows] + [1])
+    years = np.zeros((len(rows), width), dtype=np.int16)
+    for i, r in enumerate(rows):
+        years[i, :len(r['years'])] = r['years']
+
+    columns = {
+        'id': np.array([r['id'] for r in rows], dtype=str),
+        'subject': np.array([r['subject'] for r in rows], dtype=str),
+        'path': np.array([r['path'] for r in rows], dtype=str),
+        'mtime_ns': np.array([r['mtime_ns'] for r in rows], dtype=np.int64),
+        'size': np.array([r['size'] for r in rows], dtype=np.int64),
+        'years': years,
+        'correct_answer': np.array([r['correct_answer'] for r in rows], dtype=np.int8),
+        'num_choices': np.array([r['num_choices'] for r in rows], dtype=np.int8),
+        'has_explanation': np.array([r['has_explanation'] for r in rows], dtype=bool),
+    }
+    for field in CONTENT_FIELDS:
+        columns[f'{field}_chars'] = np.array([r[f'{field}_chars'] for r in rows], dtype=np.int32)
+        columns[f'{field}_images'] = np.array([r[f'{field}_images'] for r in rows], dtype=np.int16)
+        columns[f'{field}_katex'] = np.array([r[f'{field}_katex'] for r in rows], dtype=np.int16)
+    return columns
+
+
+def column_row(columns, i):
+    """Turn row i of an existing export back into a row dict."""
+    row = {name: columns[name][i].item() for name in columns if name != 'years'}
+    row['years'] = [int(y) for y in columns['years'][i] if y]
+    return row
+
+
+def load_columns(path):
+    with np.load(path, allow_pickle=False) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def build(data_dir, output, force=False):
+    """Create or incrementally refresh the export; returns (columns, stats).
+
+    The file is only rewritten when a question was added, changed or removed.
+    """
+    data_path = Path(data_dir)
+    if not data_path.is_dir():
+        print(f"Error: Directory '{data_dir}' does not exist")
+        sys.exit(1)
+
+    old = None
+    previous = {}
+    if os.path.exists(output) and not force:
+        try:
+            old = load_columns(output)
+            previous = {p: i for i, p in enumerate(old['path'])}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  Ignoring unreadable export '{output}': {e}")
+            old = None
+            previous = {}
+
+    rows = []
+    parsed = reused = 0
+    for subject_dir in sorted(p for p in data_path.iterdir() if p.is_dir()):
+        for file_path in sorted(subject_dir.glob('*.json')):
+            if file_path.name.startswith('_'):
+                continue
+            stat = file_path.stat()
+            i = previous.get(str(file_path))
+            if i is not None and old['mtime_ns'][i] == stat.st_mtime_ns and old['size'][i] == stat.st_size:
+                rows.append(column_row(old, i))
+                reused += 1
+                continue
+            try:
+                rows.append(extract_row(file_path, subject_dir.name, stat))
+                parsed += 1
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"  Error parsing {file_path}: {e}")
+
+    removed = len(set(previous) - {r['path'] for r in rows})
+    stats = {'rows': len(rows), 'parsed': parsed, 'reused': reused, 'removed': removed, 'written': False}
+    if old is not None and parsed == 0 and removed == 0:
+        return old, stats
+
+    columns = rows_to_columns(rows)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    tmp_path = f'{output}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **columns)
+    os.replace(tmp_path, output)
+    stats['written'] = True
+    return columns, stats
+
+
+def select(columns, subject=None, year=None, images_in=None, missing_explanation=False):
+    """Boolean row mask for the common filters."""
+    mask = np.ones(len(columns['id']), dtype=bool)
+    if subject:
+        mask &= columns['subject'] == subject
+    if year:
+        mask &= (columns['years'] == year).any(axis=1)
+    for field in images_in or []:
+        mask &= columns[f'{field}_images'] > 0
+    if missing_explanation:
+        mask &= ~columns['has_explanation']
+    return mask
+
+
+def papers(columns, mask, year=None):
+    """Yield (subject, year, row mask) for every paper present under mask.
+
+    With `year`, only that paper is yielded; multi-year questions would
+    otherwise add partial rows for their other years.
+    """
+    years = columns['years']
+    for subject in np.unique(columns['subject'][mask]):
+        subject_mask = mask & (columns['subject'] == subject)
+        paper_years = [year] if year else np.unique(years[subject_mask])
+        for paper_year in paper_years:
+            if paper_year:
+                yield str(subject), int(paper_year), subject_mask & (years == paper_year).any(axis=1)
+
+
+def report(columns, mask, year=None):
+    """Print per-paper audits: answer distribution, key problems, explanations."""
+    answers = columns['correct_answer'].astype(np.int16)
+    num_choices = columns['num_choices'].astype(np.int16)
+    width = max(int(num_choices.max()) if len(num_choices) else 4, 4)
+
+    header = ' '.join(f'{i:>4}' for i in range(width))
+    print(f"{'paper':<10} {'n':>4}  {header}  {'bad':>4} {'noexp':>5}  flags")
+    for subject, paper_year, paper_mask in papers(columns, mask, year):
+        n = int(paper_mask.sum())
+        valid = paper_mask & (answers >= 0) & (answers < num_choices)
+        counts = np.bincount(answers[valid], minlength=width)
+        bad = n - int(valid.sum())
+        missing = int((paper_mask & ~columns['has_explanation']).sum())
+        flags = []
+        if n and counts.max() / n >= SKEW_THRESHOLD:
+            flags.append(f'skew: {counts.argmax()} is {counts.max() / n:.0%}')
+        unused = [str(i) for i in range(4) if counts[i] == 0]
+        if n >= 10 and unused:
+            flags.append(f"never {','.join(unused)}")
+        if bad:
+            flags.append('answer out of range')
+        row = ' '.join(f'{c:>4}' for c in counts)
+        print(f"{f'{paper_year}-{subject}':<10} {n:>4}  {row}  {bad:>4} {missing:>5}  {'; '.join(flags)}")
+
+    print('\nImages / katex spans per field:')
+    for field in CONTENT_FIELDS:
+        with_images = int((mask & (columns[f'{field}_images'] > 0)).sum())
+        print(f"  {field:<12} {with_images:>4} questions with images, "
+              f"{int(columns[f'{field}_images'][mask].sum()):>4} images, "
+              f"{int(columns[f'{field}_katex'][mask].sum()):>6} katex spans, "
+              f"mean {columns[f'{field}_chars'][mask].mean() if mask.any() else 0:.0f} chars")
+
+
+def ensure_export(args):
+    """Load the export, building or refreshing it first unless --no-refresh."""
+    if args.no_refresh and os.path.exists(args.output):
+        return load_columns(args.output)
+    columns, _ = build(args.data_dir, args.output)
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Columnar (NumPy .npz) metadata export and audits of the question corpus',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build or refresh the export
+  python scripts/question_metadata.py build
+  # How many 2024 chemistry questions have images in the choices?
+  python scripts/question_metadata.py query --subject chem --year 2024 --images-in choices
+  # Which explanations are missing?
+  python scripts/question_metadata.py query --missing-explanation --list
+  # Answer-index distribution per paper, flagging skewed answer keys
+  python scripts/question_metadata.py report
+        """
+    )
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Question data directory (default: <repo>/data)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Export file (default: <repo>/data/_question_metadata.npz)')
+    parser.add_argument('--no-refresh', action='store_true',
+                        help='Query the existing export without checking for changed files')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Create or incrementally update the export')
+    build_parser.add_argument('--force', action='store_true', help='Re-parse every file')
+
+    for name, help_text in (('query', 'Count (or list) questions matching filters'),
+                            ('report', 'Per-paper answer distribution and content audit')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--subject', help='Subject directory name, e.g. chem')
+        sub.add_argument('--year', type=int, help='Paper year, e.g. 2024')
+        if name == 'query':
+            sub.add_argument('--images-in', nargs='+', choices=CONTENT_FIELDS, default=[],
+                             help='Require images in these fields')
+            sub.add_argument('--missing-explanation', action='store_true', help='Only questions without explanation')
+            sub.add_argument('--list', action='store_true', help='Print matching question ids')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        _, stats = build(args.data_dir, args.output, args.force)
+        elapsed = (time.perf_counter() - started) * 1000
+        action = 'Wrote' if stats['written'] else 'Up to date,'
+        print(f"{action} {args.output}: {stats['rows']} questions "
+              f"({stats['parsed']} parsed, {stats['reused']} unchanged, {stats['removed']} removed) in {elapsed:.0f} ms")
+        return
+
+    started = time.perf_counter()
+    columns = ensure_export(args)
+    refresh_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    if args.command == 'query':
+        mask = select(columns, args.subject, args.year, args.images_in, args.missing_explanation)
+        if args.list:
+            for question_id in columns['id'][mask]:
+                print(question_id)
+        print(f"{int(mask.sum())} matching questions")
+    else:
+        report(columns, select(columns, args.subject, args.year), args.year)
+    query_ms = (time.perf_counter() - started) * 1000
+    print(f"(refresh {refresh_ms:.1f} ms, {args.command} {query_ms:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()